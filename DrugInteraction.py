@@ -1,34 +1,40 @@
 import os
-import groq
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from cache import cached, LLM_CACHE_TTL
+
+if TYPE_CHECKING:
+    import groq
+
+# Sample database of known drug interactions. Built once at import so a
+# preloading server shares it between workers.
+INTERACTION_DB = {
+    ('aspirin', 'warfarin'): {
+        'severity': 'High',
+        'effect': 'Increased risk of bleeding',
+        'recommendation': 'Avoid combination'
+    },
+    ('ibuprofen', 'aspirin'): {
+        'severity': 'Moderate',
+        'effect': 'Decreased effectiveness of aspirin',
+        'recommendation': 'Space doses apart'
+    },
+    ('omeprazole', 'clopidogrel'): {
+        'severity': 'High',
+        'effect': 'Reduced effectiveness of clopidogrel',
+        'recommendation': 'Consider alternative medications'
+    },
+    ('simvastatin', 'erythromycin'): {
+        'severity': 'High',
+        'effect': 'Increased risk of muscle damage',
+        'recommendation': 'Avoid combination'
+    }
+}
 
 class DrugInteractionChecker:
     def __init__(self):
         """Initialize the drug interaction checker with a basic database."""
-        # Sample database of known drug interactions
-        self._interaction_db = {
-            ('aspirin', 'warfarin'): {
-                'severity': 'High',
-                'effect': 'Increased risk of bleeding',
-                'recommendation': 'Avoid combination'
-            },
-            ('ibuprofen', 'aspirin'): {
-                'severity': 'Moderate',
-                'effect': 'Decreased effectiveness of aspirin',
-                'recommendation': 'Space doses apart'
-            },
-            ('omeprazole', 'clopidogrel'): {
-                'severity': 'High',
-                'effect': 'Reduced effectiveness of clopidogrel',
-                'recommendation': 'Consider alternative medications'
-            },
-            ('simvastatin', 'erythromycin'): {
-                'severity': 'High',
-                'effect': 'Increased risk of muscle damage',
-                'recommendation': 'Avoid combination'
-            }
-        }
+        self._interaction_db = INTERACTION_DB
 
     def _normalize_drug_name(self, drug: str) -> str:
         """Normalize drug name for consistent comparison."""
@@ -57,8 +63,10 @@ class DrugInteractionChecker:
             drugs.update(drug_pair)
         return sorted(list(drugs))
 
-def setup_groq_client() -> Optional[groq.Client]:
+def setup_groq_client() -> Optional['groq.Client']:
     """Set up and return Groq client with API key."""
+    import groq
+
     load_dotenv()
     api_key = os.getenv('GROQ_API_KEY')
     if not api_key:
@@ -66,9 +74,10 @@ def setup_groq_client() -> Optional[groq.Client]:
         return None
     return groq.Client(api_key=api_key)
 
-def get_ai_drug_interaction(drug1: str, drug2: str) -> Optional[str]:
-    """Query Groq API for additional drug interaction information."""
-    client = setup_groq_client()
+@cached('llm:drug_interaction', LLM_CACHE_TTL)
+def get_ai_drug_interaction(drug1: str, drug2: str, client: Optional['groq.Client'] = None) -> Optional[str]:
+    """Query Groq API for additional drug interaction information, optionally reusing `client`."""
+    client = client or setup_groq_client()
     if not client:
         return None
 
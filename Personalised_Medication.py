@@ -1,12 +1,17 @@
 import os
-import groq
 import time
-from typing import Optional, List, Dict
+from typing import TYPE_CHECKING, Optional, List, Dict
 from dotenv import load_dotenv
+from cache import cached, LLM_CACHE_TTL
 from DrugInteraction import DrugInteractionChecker
 
-def setup_groq_client() -> Optional[groq.Client]:
+if TYPE_CHECKING:
+    import groq
+
+def setup_groq_client() -> Optional['groq.Client']:
     """Set up and return Groq client with API key."""
+    import groq
+
     load_dotenv()
     api_key = os.getenv('GROQ_API_KEY')
     if not api_key:
@@ -89,6 +94,7 @@ def get_health_assessment(conversation_history: List[Dict[str, str]]) -> Optiona
         print(f"Error during API call: {str(e)}")
         return None
 
+@cached('llm:medication', LLM_CACHE_TTL)
 def get_personalized_medication(condition: str, patient_allergies: List[str] = None, current_medications: List[str] = None) -> Optional[str]:
     """
     Get personalized medication recommendations based on condition and patient factors.
@@ -1,13 +1,29 @@
 from flask import Flask, render_template, request, jsonify
 from symptom_checker import get_disease_from_symptoms
 from DrugInteraction import DrugInteractionChecker, get_ai_drug_interaction
-from Personalised_Medication import get_personalized_medication, check_medication_safety
-from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
-import overpy
+from Personalised_Medication import get_personalized_medication, check_medication_safety, get_health_assessment
+from job_queue import JobQueue, QueueFullError
+from cache_warmer import start_cache_warmer
+from hospital_locator import geocode_address, find_facilities, to_tile
+import assets
+import gc
 import html
+import importlib
 
 app = Flask(__name__)
+assets.init_app(app)
+
+# Imported lazily by the request handlers, or up front by preload_shared_state
+PRELOAD_MODULES = ('groq', 'overpy', 'geopy.distance', 'geopy.geocoders')
+
+# Longest a GET /jobs/<id>?wait=N request may block. It holds a server worker
+# the whole time, so clients should poll rather than wait for long.
+MAX_JOB_WAIT = 2
+
+@app.before_request
+def ensure_cache_warmer():
+    # Started on the first request so the thread runs in each forked worker
+    start_cache_warmer()
 
 @app.route('/')
 def index():
@@ -54,36 +70,117 @@ def drug_interaction():
             
     return render_template('drug_interaction.html')
 
+def build_personalized_medication(data: dict) -> dict:
+    """Generate recommendations for a condition and check them against current medications."""
+    condition = data.get('condition')
+    allergies = data.get('allergies', [])
+    current_meds = data.get('current_medications', [])
+
+    recommendations = get_personalized_medication(condition, allergies, current_meds)
+    if not recommendations:
+        raise ValueError('Could not generate medication recommendations at this time')
+    if current_meds and recommendations:
+        interactions = check_medication_safety(
+            [med.strip() for med in recommendations.lower().split() if med.strip()],
+            current_meds
+        )
+    else:
+        interactions = {}
+
+    return {
+        'recommendations': recommendations,
+        'interactions': interactions
+    }
+
+def build_health_assessment(data: dict) -> dict:
+    """Generate a health assessment from a follow-up conversation."""
+    assessment = get_health_assessment(data.get('conversation_history'))
+    if not assessment:
+        raise ValueError('Could not generate a health assessment at this time')
+    return {'assessment': assessment}
+
+job_queue = JobQueue()
+job_queue.register('personalized-medication', build_personalized_medication)
+job_queue.register('health-assessment', build_health_assessment)
+
+# Field each job type needs before it is worth queueing
+JOB_REQUIRED_FIELDS = {
+    'personalized-medication': 'condition',
+    'health-assessment': 'conversation_history',
+}
+
 @app.route('/personalized-medication', methods=['GET', 'POST'])
 def personalized_medication():
     if request.method == 'POST':
         data = request.json
-        condition = data.get('condition')
-        allergies = data.get('allergies', [])
-        current_meds = data.get('current_medications', [])
-        
-        if condition:
-            recommendations = get_personalized_medication(condition, allergies, current_meds)
-            if current_meds:
-                interactions = check_medication_safety(
-                    [med.strip() for med in recommendations.lower().split() if med.strip()],
-                    current_meds
-                )
-            else:
-                interactions = {}
-                
-            return jsonify({
-                'recommendations': recommendations,
-                'interactions': interactions
-            })
+        if data.get('condition'):
+            try:
+                return jsonify(build_personalized_medication(data))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 503
     return render_template('personalized_medication.html')
 
+def is_conversation_history(history) -> bool:
+    """Check that a conversation is a list of {role, content} messages from the user and assistant."""
+    return isinstance(history, list) and all(
+        isinstance(message, dict)
+        and message.get('role') in ('user', 'assistant')
+        and isinstance(message.get('content'), str)
+        for message in history
+    )
+
+@app.route('/jobs/<job_type>', methods=['POST'])
+def submit_job(job_type):
+    if job_type not in JOB_REQUIRED_FIELDS:
+        return jsonify({'error': f'Unknown job type: {job_type}'}), 404
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    if not data.get(JOB_REQUIRED_FIELDS[job_type]):
+        return jsonify({'error': f'{JOB_REQUIRED_FIELDS[job_type]} is required'}), 400
+    condition = data.get('condition')
+    if job_type == 'personalized-medication' and not (isinstance(condition, str) and condition.strip()):
+        return jsonify({'error': 'condition must be a non-empty string'}), 400
+    if job_type == 'health-assessment' and not is_conversation_history(data['conversation_history']):
+        return jsonify({'error': 'conversation_history must be a list of {role, content} messages'}), 400
+
+    try:
+        priority = max(0, min(int(request.args.get('priority', 0)), 9))
+    except ValueError:
+        return jsonify({'error': 'priority must be an integer from 0 to 9'}), 400
+
+    try:
+        job = job_queue.submit(job_type, data, priority=priority)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+
+    return jsonify(job), 202, {'Location': f"/jobs/{job['job_id']}"}
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    try:
+        wait = max(0.0, min(float(request.args.get('wait', 0)), MAX_JOB_WAIT))
+    except ValueError:
+        return jsonify({'error': 'wait must be a number of seconds'}), 400
+
+    job = job_queue.wait(job_id, wait) if wait else job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    return jsonify(job)
+
 @app.route('/hospital-locator')
 def hospital_locator():
     return render_template('hospital_locator.html')
 
 @app.route('/hospital-locator', methods=['POST'])
 def find_hospitals():
+    # geopy and overpy are only needed here, so load them on first use
+    from geopy.distance import geodesic
+    import overpy
+
     try:
         data = request.get_json()
         if not data:
@@ -102,121 +199,85 @@ def find_hospitals():
         print(f"Searching for: {address} with radius {radius}m")
 
         try:
-            # Initialize geocoder with a longer timeout and user agent
-            geolocator = Nominatim(
-                user_agent="chiron_healthcare_assistant",
-                timeout=10
-            )
-            
-            # Get user's location with more specific parameters
-            location = geolocator.geocode(
-                address,
-                exactly_one=True,
-                language="en",
-                country_codes="in"  # Limit to India
-            )
+            location = geocode_address(address)
             
             if not location:
                 return jsonify({'error': 'Could not find the specified location. Please try a more specific address in India.'})
             
-            print(f"Found location: {location.address} at {location.latitude}, {location.longitude}")
+            print(f"Found location: {location['address']} at {location['lat']}, {location['lon']}")
             
-            user_location = (location.latitude, location.longitude)
+            user_location = (location['lat'], location['lon'])
         except Exception as e:
             print(f"Geocoding error: {str(e)}")
             return jsonify({'error': 'Failed to find the location. Please try a more specific address.'})
         
         try:
-            # Get medical facilities using a simpler query
-            api = overpy.Overpass()
-            
-            # Split the query into two parts to avoid timeout
-            # First query: Hospitals
-            hospital_query = f"""
-            [out:json][timeout:25];
-            (
-              node["amenity"="hospital"](around:{radius},{user_location[0]},{user_location[1]});
-              way["amenity"="hospital"](around:{radius},{user_location[0]},{user_location[1]});
-            );
-            out body;
-            >;
-            out skel qt;
-            """
-            
-            # Second query: Pharmacies
-            pharmacy_query = f"""
-            [out:json][timeout:25];
-            (
-              node["amenity"="pharmacy"](around:{radius},{user_location[0]},{user_location[1]});
-              way["amenity"="pharmacy"](around:{radius},{user_location[0]},{user_location[1]});
-            );
-            out body;
-            >;
-            out skel qt;
-            """
+            # Query hospitals and pharmacies separately to avoid timeouts;
+            # results are cached per map tile
+            tile = to_tile(*user_location)
             
             print("Querying hospitals...")
-            hospital_result = api.query(hospital_query)
-            print(f"Found {len(hospital_result.nodes)} hospital nodes and {len(hospital_result.ways)} hospital ways")
+            hospital_nodes = find_facilities(tile[0], tile[1], radius, 'hospital')
             
             print("Querying pharmacies...")
-            pharmacy_result = api.query(pharmacy_query)
-            print(f"Found {len(pharmacy_result.nodes)} pharmacy nodes and {len(pharmacy_result.ways)} pharmacy ways")
+            pharmacy_nodes = find_facilities(tile[0], tile[1], radius, 'pharmacy')
             
             facilities = []
             hospitals_count = 0
             pharmacies_count = 0
             
             # Process hospital nodes
-            for node in hospital_result.nodes:
-                name = node.tags.get('name', 'Hospital')
-                facility_coords = (node.lat, node.lon)
+            for node in hospital_nodes:
+                tags = node['tags']
+                name = tags.get('name', 'Hospital')
+                facility_coords = (node['lat'], node['lon'])
                 distance = round(geodesic(user_location, facility_coords).kilometers, 2)
                 
                 details = {
-                    'phone': node.tags.get('phone', 'Not available'),
-                    'emergency': node.tags.get('emergency', 'Unknown'),
-                    'healthcare': node.tags.get('healthcare', 'General'),
-                    'opening_hours': node.tags.get('opening_hours', 'Not specified'),
-                    'website': node.tags.get('website', ''),
-                    'wheelchair': node.tags.get('wheelchair', 'Unknown'),
-                    'address': node.tags.get('addr:full', node.tags.get('addr:street', 'Address not available'))
+                    'phone': tags.get('phone', 'Not available'),
+                    'emergency': tags.get('emergency', 'Unknown'),
+                    'healthcare': tags.get('healthcare', 'General'),
+                    'opening_hours': tags.get('opening_hours', 'Not specified'),
+                    'website': tags.get('website', ''),
+                    'wheelchair': tags.get('wheelchair', 'Unknown'),
+                    'address': tags.get('addr:full', tags.get('addr:street', 'Address not available'))
                 }
                 
                 facility = {
                     'type': 'hospital',
                     'name': html.escape(name),
-                    'lat': float(node.lat),
-                    'lon': float(node.lon),
+                    'lat': node['lat'],
+                    'lon': node['lon'],
                     'distance': distance,
                     'details': details,
-                    'directions_url': f"https://www.google.com/maps/dir/?api=1&origin={user_location[0]},{user_location[1]}&destination={node.lat},{node.lon}&travelmode=driving"
+                    'directions_url': f"https://www.google.com/maps/dir/?api=1&origin={user_location[0]},{user_location[1]}&destination={node['lat']},{node['lon']}&travelmode=driving"
                 }
                 facilities.append(facility)
                 hospitals_count += 1
             
             # Process pharmacy nodes
-            for node in pharmacy_result.nodes:
-                name = node.tags.get('name', 'Pharmacy')
-                facility_coords = (node.lat, node.lon)
+            for node in pharmacy_nodes:
+                tags = node['tags']
+                name = tags.get('name', 'Pharmacy')
+                facility_coords = (node['lat'], node['lon'])
                 distance = round(geodesic(user_location, facility_coords).kilometers, 2)
                 
                 details = {
-                    'phone': node.tags.get('phone', 'Not available'),
-                    'opening_hours': node.tags.get('opening_hours', 'Not specified'),
-                    'website': node.tags.get('website', ''),
-                    'wheelchair': node.tags.get('wheelchair', 'Unknown'),
-                    'address': node.tags.get('addr:full', node.tags.get('addr:street', 'Address not available'))
+                    'phone': tags.get('phone', 'Not available'),
+                    'opening_hours': tags.get('opening_hours', 'Not specified'),
+                    'website': tags.get('website', ''),
+                    'wheelchair': tags.get('wheelchair', 'Unknown'),
+                    'address': tags.get('addr:full', tags.get('addr:street', 'Address not available'))
                 }
                 
                 facility = {
                     'type': 'pharmacy',
                     'name': html.escape(name),
-                    'lat': float(node.lat),
-                    'lon': float(node.lon),
+                    'lat': node['lat'],
+                    'lon': node['lon'],
                     'distance': distance,
                     'details': details,
-                    'directions_url': f"https://www.google.com/maps/dir/?api=1&origin={user_location[0]},{user_location[1]}&destination={node.lat},{node.lon}&travelmode=driving"
+                    'directions_url': f"https://www.google.com/maps/dir/?api=1&origin={user_location[0]},{user_location[1]}&destination={node['lat']},{node['lon']}&travelmode=driving"
                 }
                 facilities.append(facility)
                 pharmacies_count += 1
@@ -228,7 +289,7 @@ def find_hospitals():
                 'user_location': {
                     'lat': float(user_location[0]),
                     'lon': float(user_location[1]),
-                    'address': location.address
+                    'address': location['address']
                 },
                 'facilities': facilities,
                 'stats': {
@@ -257,5 +318,17 @@ def find_hospitals():
         print(f"Error in find_hospitals: {str(e)}")
         return jsonify({'error': 'An error occurred while searching for medical facilities. Please try again.'})
 
+def preload_shared_state():
+    """
+    Import heavy dependencies once in the gunicorn master, before workers are
+    forked, so every worker shares them copy-on-write instead of importing its
+    own copy. Read-only data such as INTERACTION_DB is already built at import.
+    """
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+    # Keep the garbage collector from touching (and so copying) shared objects
+    gc.freeze()
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,75 @@
+import os
+import json
+from typing import Dict, List
+from flask import request
+from markupsafe import Markup, escape
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+POPPINS_URL = 'https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600&display=swap'
+
+# Logical asset name -> source files, in order. `python build_assets.py`
+# turns each entry into one minified, content-hashed file in static/dist.
+# Until it has run, templates link the sources directly.
+BUNDLES: Dict[str, List[str]] = {
+    'site.css': [
+        POPPINS_URL,
+        '/static/vendor/fontawesome-free-6.6.0/css/all.min.css',
+        '/static/styles.css',
+    ],
+    'leaflet.css': ['/static/vendor/leaflet-1.9.3/leaflet.css'],
+    'leaflet.js': ['/static/vendor/leaflet-1.9.3/leaflet.js'],
+    'js/symptom_checker.js': ['/static/js/symptom_checker.js'],
+    'js/drug_interaction.js': ['/static/js/drug_interaction.js'],
+    'js/personalized_medication.js': ['/static/js/personalized_medication.js'],
+    'js/hospital_locator.js': ['/static/js/hospital_locator.js'],
+}
+
+# Fingerprinted files never change under the same name
+IMMUTABLE_CACHE_SECONDS = 365 * 24 * 3600
+
+def load_manifest() -> Dict[str, List[str]]:
+    """Read the build manifest, or return an empty one if assets have not been built."""
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+_manifest = load_manifest()
+
+def asset_urls(name: str) -> List[str]:
+    """Return the URLs to load for a logical asset name."""
+    return _manifest.get(name) or BUNDLES[name]
+
+def stylesheet(name: str) -> Markup:
+    return Markup('\n    '.join(
+        f'<link rel="stylesheet" href="{escape(url)}">' for url in asset_urls(name)
+    ))
+
+def script(name: str) -> Markup:
+    return Markup('\n    '.join(
+        f'<script src="{escape(url)}"></script>' for url in asset_urls(name)
+    ))
+
+def add_cache_headers(response):
+    """Mark fingerprinted files immutable and let browsers revalidate pages with ETags."""
+    if request.path.startswith('/static/dist/') and response.status_code == 200:
+        # send_file marks static files no-cache; hashed names never need revalidating
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_CACHE_SECONDS
+        response.cache_control.immutable = True
+    elif (request.method == 'GET' and response.status_code == 200
+            and response.mimetype == 'text/html'):
+        response.cache_control.no_cache = True
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
+def init_app(app):
+    """Register the template helpers and cache headers on a Flask app."""
+    app.jinja_env.globals.update(stylesheet=stylesheet, script=script)
+    app.after_request(add_cache_headers)
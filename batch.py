@@ -0,0 +1,202 @@
+"""
+Batch symptom and drug interaction analysis over JSONL files.
+
+Records are streamed from the input file, analysed with bounded concurrency
+and written to the output as NDJSON in input order, so memory use does not
+grow with the size of the file. Because output is ordered and flushed line by
+line, it doubles as the checkpoint: `--resume` skips as many input records as
+there are complete lines in the output file.
+
+The shared answer cache is bypassed unless `--use-cache` is given, so
+regression runs exercise the model. Batch calls never count towards the
+cache's popularity or hit statistics.
+
+Input records:
+    symptoms: {"id": "case-1", "symptoms": "fever, cough"}
+    drugs:    {"id": "pair-1", "drug1": "aspirin", "drug2": "warfarin"}
+
+Usage:
+    python batch.py symptoms cases.jsonl -o results.ndjson --concurrency 8 --rate 30
+    python batch.py drugs pairs.jsonl -o results.ndjson --resume --use-cache
+"""
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from symptom_checker import setup_groq_client, get_disease_from_symptoms
+from DrugInteraction import DrugInteractionChecker, get_ai_drug_interaction
+from rate_limit import RateLimiter
+
+# Attempts per record before it is written out as failed
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 2.0
+
+_checker = DrugInteractionChecker()
+
+def required_text(record: Dict[str, Any], field: str) -> str:
+    """Return a record's field, raising ValueError unless it is a non-empty string."""
+    value = record.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"Record field '{field}' must be a non-empty string")
+    return value
+
+def analyze_symptoms(record: Dict[str, Any], client, use_cache: bool) -> Dict[str, Any]:
+    symptoms = required_text(record, 'symptoms')
+    result = get_disease_from_symptoms(symptoms, client=client, use_cache=use_cache, record=False)
+    if result is None:
+        raise RuntimeError("Symptom analysis failed")
+    return {'result': result}
+
+def analyze_drug_pair(record: Dict[str, Any], client, use_cache: bool) -> Dict[str, Any]:
+    drug1 = required_text(record, 'drug1')
+    drug2 = required_text(record, 'drug2')
+    db_result = _checker.check_interaction(drug1, drug2)
+    ai_result = get_ai_drug_interaction(drug1, drug2, client=client, use_cache=use_cache, record=False)
+    if ai_result is None:
+        raise RuntimeError("AI drug interaction analysis failed")
+    return {'database_result': db_result, 'ai_result': ai_result}
+
+ANALYZERS: Dict[str, Callable[[Dict[str, Any], Any, bool], Dict[str, Any]]] = {
+    'symptoms': analyze_symptoms,
+    'drugs': analyze_drug_pair,
+}
+
+def read_records(path: str, skip: int = 0) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield (index, record, parse_error) for each non-blank line, starting after `skip` records."""
+    with open(path, encoding='utf-8') as f:
+        index = 0
+        for line in f:
+            if not line.strip():
+                continue
+            if index >= skip:
+                try:
+                    yield index, json.loads(line), None
+                except json.JSONDecodeError as e:
+                    yield index, None, f"Invalid JSON: {str(e)}"
+            index += 1
+
+def count_completed(path: str) -> int:
+    """
+    Count complete lines in an existing output file, truncating a partial
+    last line left behind by an interrupted run.
+    """
+    try:
+        with open(path, 'rb+') as f:
+            completed = 0
+            last_newline = 0
+            position = 0
+            for line in f:
+                position += len(line)
+                if line.endswith(b'\n'):
+                    completed += 1
+                    last_newline = position
+            f.truncate(last_newline)
+            return completed
+    except FileNotFoundError:
+        return 0
+
+def process_record(mode: str, index: int, record: Optional[Dict[str, Any]], parse_error: Optional[str],
+                   client, limiter: RateLimiter, use_cache: bool = False) -> Dict[str, Any]:
+    output = {'index': index, 'id': record.get('id') if isinstance(record, dict) else None}
+    if parse_error:
+        output['error'] = parse_error
+        return output
+    if not isinstance(record, dict):
+        output['error'] = "Record must be a JSON object"
+        return output
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        limiter.wait()
+        try:
+            output.update(ANALYZERS[mode](record, client, use_cache))
+            return output
+        except ValueError as e:
+            output['error'] = str(e)
+            return output
+        except Exception as e:
+            output['error'] = str(e)
+            if attempt < MAX_ATTEMPTS:
+                time.sleep(RETRY_BACKOFF * attempt)
+    return output
+
+def run_batch(mode: str, input_path: str, output_path: str, concurrency: int = 4,
+              rate: float = 0, resume: bool = False, progress_every: int = 1000,
+              use_cache: bool = False) -> Dict[str, Any]:
+    """
+    Analyse every record in `input_path` and append the results to `output_path`.
+    With `use_cache`, answers are read from and stored in the shared cache, but
+    batch calls are never counted in its popularity or hit statistics.
+    """
+    client = setup_groq_client()
+    if not client:
+        raise ValueError("GROQ_API_KEY is required for batch analysis")
+
+    skip = count_completed(output_path) if resume else 0
+    limiter = RateLimiter(rate)
+    written = 0
+    failed = 0
+    start = time.monotonic()
+
+    # Keep a bounded window of in-flight records and write them out in order
+    window = max(concurrency * 2, 1)
+    pending = deque()
+
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as out, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        def write_oldest():
+            nonlocal written, failed
+            result = pending.popleft().result()
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+            written += 1
+            failed += 'error' in result
+            if progress_every and written % progress_every == 0:
+                rate_now = written / (time.monotonic() - start)
+                print(f"{skip + written} records done ({rate_now:.1f}/s, {failed} failed)", file=sys.stderr)
+
+        for index, record, parse_error in read_records(input_path, skip):
+            pending.append(executor.submit(process_record, mode, index, record, parse_error, client, limiter, use_cache))
+            if len(pending) >= window:
+                write_oldest()
+        while pending:
+            write_oldest()
+
+    elapsed = time.monotonic() - start
+    return {
+        'skipped': skip,
+        'processed': written,
+        'failed': failed,
+        'seconds': round(elapsed, 2),
+        'records_per_second': round(written / elapsed, 1) if elapsed else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch symptom and drug interaction analysis over JSONL files.")
+    parser.add_argument('mode', choices=sorted(ANALYZERS))
+    parser.add_argument('input', help="JSONL file with one record per line")
+    parser.add_argument('-o', '--output', required=True, help="NDJSON file to write results to")
+    parser.add_argument('--concurrency', type=int, default=4, help="Groq requests in flight at once")
+    parser.add_argument('--rate', type=float, default=0, help="Maximum Groq requests per minute (0 = unlimited)")
+    parser.add_argument('--resume', action='store_true', help="Continue after the records already in the output file")
+    parser.add_argument('--use-cache', action='store_true',
+                        help="Reuse and store answers in the shared cache (default: always call Groq)")
+    args = parser.parse_args()
+
+    try:
+        summary = run_batch(args.mode, args.input, args.output, args.concurrency, args.rate, args.resume,
+                            use_cache=args.use_cache)
+        print(json.dumps(summary), file=sys.stderr)
+    except ValueError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nBatch interrupted. Re-run with --resume to continue.", file=sys.stderr)
+        sys.exit(130)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Measure batch.py throughput and peak memory against a local Groq stand-in.
+
+A small HTTP server answers chat completion requests with a canned reply, and
+batch.py is pointed at it through GROQ_BASE_URL. Run from the repo root:
+
+    python benchmarks/bench_batch.py --records 100000 --concurrency 32
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMPLETION = json.dumps({
+    'id': 'chatcmpl-local',
+    'object': 'chat.completion',
+    'created': 0,
+    'model': 'mixtral-8x7b-32768',
+    'choices': [{
+        'index': 0,
+        'finish_reason': 'stop',
+        'message': {'role': 'assistant', 'content': 'Possible conditions: common cold. Consult a healthcare provider.'},
+    }],
+    'usage': {'prompt_tokens': 50, 'completion_tokens': 20, 'total_tokens': 70},
+}).encode('utf-8')
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+def write_input(path, mode, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            if mode == 'symptoms':
+                record = {'id': f'case-{i}', 'symptoms': f'fever, cough, headache for {i % 14 + 1} days'}
+            else:
+                record = {'id': f'pair-{i}', 'drug1': 'aspirin', 'drug2': f'drug-{i % 500}'}
+            f.write(json.dumps(record) + '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--mode', choices=['symptoms', 'drugs'], default='symptoms')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated Groq latency in seconds')
+    args = parser.parse_args()
+
+    FakeGroqHandler.latency = args.latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGroqHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    workdir = tempfile.mkdtemp()
+    input_path = os.path.join(workdir, 'input.jsonl')
+    output_path = os.path.join(workdir, 'output.ndjson')
+    write_input(input_path, args.mode, args.records)
+
+    env = dict(os.environ,
+               GROQ_API_KEY='local-stand-in',
+               GROQ_BASE_URL=f'http://127.0.0.1:{server.server_address[1]}')
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'batch.py'), args.mode, input_path,
+         '-o', output_path, '--concurrency', str(args.concurrency)],
+        cwd=ROOT, env=env, check=True, stderr=subprocess.DEVNULL
+    )
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    with open(output_path, encoding='utf-8') as f:
+        written = sum(1 for _ in f)
+    print(f"{written} {args.mode} records in {elapsed:.1f}s "
+          f"({written / elapsed:.0f} records/s), peak RSS {peak_rss_mb:.1f} MB")
+
+if __name__ == '__main__':
+    main()
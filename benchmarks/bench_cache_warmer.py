@@ -0,0 +1,126 @@
+"""
+Simulate the first hour after a deploy and report cache hit rates.
+
+Groq, Nominatim and Overpass are replaced by in-process stand-ins, and a
+Zipf-distributed stream of requests (popular queries first) is replayed
+through the cached functions. Three deploys are compared:
+
+    cold       no warm-up
+    configured warm-up from the built-in warm list only
+    access log warm-up from the previous deploy's recorded traffic
+
+Run from the repo root:
+
+    python benchmarks/bench_cache_warmer.py --requests 3000
+"""
+import os
+import sys
+import random
+import argparse
+import tempfile
+import contextlib
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def fake_groq_client():
+    reply = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='stand-in analysis'))])
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: reply)))
+
+class FakeNominatim:
+    def __init__(self, **kwargs):
+        pass
+
+    def geocode(self, address, **kwargs):
+        seed = abs(hash(address))
+        return SimpleNamespace(latitude=8 + seed % 2000 / 100, longitude=70 + seed % 1500 / 100,
+                               address=address.title())
+
+class FakeOverpass:
+    def query(self, query):
+        node = SimpleNamespace(lat=12.97, lon=77.59, tags={'name': 'Stand-in Hospital'})
+        return SimpleNamespace(nodes=[node], ways=[])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=3000, help='requests in the simulated hour')
+    parser.add_argument('--pool', type=int, default=200, help='distinct queries per feature')
+    parser.add_argument('--zipf', type=float, default=1.1)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ['CHIRON_CACHE_DB'] = os.path.join(tempfile.mkdtemp(), 'cache.sqlite3')
+    import symptom_checker
+    import DrugInteraction
+    import Personalised_Medication
+    import hospital_locator
+    import geopy.geocoders
+    import overpy
+    import cache_warmer
+    from cache import get_cache
+
+    for module in (symptom_checker, DrugInteraction, Personalised_Medication):
+        module.setup_groq_client = fake_groq_client
+    geopy.geocoders.Nominatim = FakeNominatim
+    overpy.Overpass = FakeOverpass
+
+    warm_list = cache_warmer.DEFAULT_WARM_LIST
+    known_drugs = DrugInteraction.DrugInteractionChecker().get_all_known_drugs()
+    pools = {
+        'symptoms': warm_list['symptoms'] + [f'symptom set {i}' for i in range(args.pool)],
+        'conditions': warm_list['conditions'] + [f'condition {i}' for i in range(args.pool)],
+        'locations': warm_list['locations'] + [f'locality {i}' for i in range(args.pool)],
+        # The most checked pairs in this traffic are not all in the local database
+        'drug_pairs': [('aspirin', 'warfarin'), ('paracetamol', 'ibuprofen'), ('aspirin', 'ibuprofen')]
+                      + [(known_drugs[i % len(known_drugs)], f'drug {i}') for i in range(args.pool)],
+    }
+    pools = {name: pool[:args.pool] for name, pool in pools.items()}
+    weights = [1 / (rank + 1) ** args.zipf for rank in range(args.pool)]
+
+    def replay(rng, count):
+        for _ in range(count):
+            feature = rng.choice(list(pools))
+            query = rng.choices(pools[feature], weights)[0]
+            if feature == 'symptoms':
+                symptom_checker.get_disease_from_symptoms(query)
+            elif feature == 'conditions':
+                Personalised_Medication.get_personalized_medication(query, [], [])
+            elif feature == 'drug_pairs':
+                DrugInteraction.get_ai_drug_interaction(*query)
+            else:
+                location = hospital_locator.geocode_address(query)
+                lat, lon = hospital_locator.to_tile(location['lat'], location['lon'])
+                for amenity in ('hospital', 'pharmacy'):
+                    hospital_locator.find_facilities(lat, lon, 5000, amenity)
+
+    def new_deploy(keep_access_log):
+        conn = get_cache()._connect()
+        conn.execute("DELETE FROM cache")
+        conn.execute("DELETE FROM stats")
+        if not keep_access_log:
+            conn.execute("DELETE FROM access")
+
+    def overall_hit_rate():
+        stats = get_cache().hit_rate().values()
+        hits = sum(s['hits'] for s in stats)
+        return hits / (hits + sum(s['misses'] for s in stats))
+
+    unlimited = {service: 0 for service in cache_warmer.UPSTREAM_RATES}
+    print(f"{args.requests} requests, {args.pool} distinct queries per feature, Zipf s={args.zipf}")
+    for name, warm, keep_access_log in (('cold', False, False),
+                                        ('configured', True, False),
+                                        ('access log', True, True)):
+        new_deploy(keep_access_log)
+        rng = random.Random(args.seed)
+        early = args.requests // 10
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            calls = cache_warmer.warm_cycle(rates=unlimited) if warm else {}
+            replay(rng, early)
+            early_rate = overall_hit_rate()
+            replay(rng, args.requests - early)
+        per_namespace = ', '.join(f"{ns} {s['hit_rate']:.0%}" for ns, s in sorted(get_cache().hit_rate().items()))
+        print(f"{name:>10}: warm-up calls {sum(calls.values()):>3}, hit rate first {early} requests "
+              f"{early_rate:.1%}, whole hour {overall_hit_rate():.1%} [{per_namespace}]")
+
+if __name__ == '__main__':
+    main()
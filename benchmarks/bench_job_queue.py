@@ -0,0 +1,85 @@
+"""
+Compare inline personalized-medication requests with the job queue.
+
+The Groq call is replaced by a fixed sleep so the numbers only reflect how
+long request workers are held, not model latency. Run from the repo root:
+
+    python benchmarks/bench_job_queue.py --requests 40 --latency 0.5
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def run_clients(client_count, work):
+    """Run `work(i)` for each client thread and return wall time and summed busy time."""
+    busy = [0.0] * client_count
+    threads = []
+    start = time.perf_counter()
+    for i in range(client_count):
+        thread = threading.Thread(target=lambda i=i: busy.__setitem__(i, work(i)))
+        threads.append(thread)
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sum(busy)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.5, help='simulated LLM latency in seconds')
+    parser.add_argument('--request-workers', type=int, default=4, help='simulated gunicorn workers')
+    parser.add_argument('--job-workers', type=int, default=4)
+    args = parser.parse_args()
+
+    os.environ['CHIRON_JOB_DB'] = os.path.join(tempfile.mkdtemp(), 'jobs.sqlite3')
+    os.environ['CHIRON_JOB_WORKERS'] = str(args.job_workers)
+    os.environ['CHIRON_MAX_QUEUED_JOBS'] = str(args.requests)
+    import app as chiron_app
+
+    def fake_llm(condition, allergies=None, current_medications=None):
+        time.sleep(args.latency)
+        return f"RECOMMENDED MEDICATIONS for {condition}"
+
+    chiron_app.get_personalized_medication = fake_llm
+    client = chiron_app.app.test_client()
+    per_client = args.requests // args.request_workers
+
+    def inline(i):
+        busy = 0.0
+        for n in range(per_client):
+            t = time.perf_counter()
+            client.post('/personalized-medication', json={'condition': f'inline {i}-{n}'})
+            busy += time.perf_counter() - t
+        return busy
+
+    def queued(i):
+        busy = 0.0
+        job_ids = []
+        for n in range(per_client):
+            t = time.perf_counter()
+            job_ids.append(client.post('/jobs/personalized-medication', json={'condition': f'job {i}-{n}'}).json['job_id'])
+            busy += time.perf_counter() - t
+        for job_id in job_ids:
+            while True:
+                t = time.perf_counter()
+                status = client.get(f'/jobs/{job_id}').json['status']
+                busy += time.perf_counter() - t
+                if status not in ('queued', 'running'):
+                    break
+                time.sleep(0.1)
+        return busy
+
+    total = per_client * args.request_workers
+    for name, work in (('inline', inline), ('job queue', queued)):
+        wall, busy = run_clients(args.request_workers, work)
+        occupancy = busy / (wall * args.request_workers)
+        print(f"{name:>10}: {total} requests in {wall:.2f}s "
+              f"({total / wall:.1f} req/s), request-worker occupancy {occupancy:.1%}")
+
+if __name__ == '__main__':
+    main()
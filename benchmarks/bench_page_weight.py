@@ -0,0 +1,169 @@
+"""
+Compare page weight and request counts before and after the asset pipeline.
+
+Each page is loaded twice through the Flask test client by a small browser
+model: once cold, with an empty cache, and once warm. On the warm load, responses
+with a max-age and without no-cache or no-store are reused without a request.
+Responses with an ETag or Last-Modified are revalidated, and anything else is
+fetched again.
+
+"before" renders the templates from a git revision that still linked the CDNs.
+Font Awesome and Leaflet are measured from the vendored copies of the same
+files. Google Fonts cannot be measured offline, so it is counted as a request
+with unknown size. "after" uses the current templates and, if present, the
+static/dist build. Run from the repo root after `python build_assets.py`:
+
+    python benchmarks/bench_page_weight.py
+"""
+import os
+import re
+import sys
+import gzip
+import argparse
+import tempfile
+import subprocess
+from urllib.parse import urljoin, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('CHIRON_CACHE_WARM', '0')
+
+PAGES = {
+    'index.html': '/',
+    'symptom_checker.html': '/symptom-checker',
+    'drug_interaction.html': '/drug-interaction',
+    'personalized_medication.html': '/personalized-medication',
+    'hospital_locator.html': '/hospital-locator',
+}
+
+# Old CDN prefixes -> vendored copies of the same files, used to size them
+# offline. cdnjs and unpkg send a year-long max-age, so these are cached as fresh.
+CDN_EQUIVALENTS = {
+    'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/': '/static/vendor/fontawesome-free-6.6.0/',
+    'https://unpkg.com/leaflet@1.7.1/dist/': '/static/vendor/leaflet-1.9.3/',
+}
+
+TAG_URL = re.compile(r'<link[^>]+rel="stylesheet"[^>]+href="([^"]+)"|<link[^>]+href="([^"]+)"[^>]+rel="stylesheet"'
+                     r'|<script[^>]+src="([^"]+)"')
+CSS_FONT_URL = re.compile(r'url\(\s*[\'"]?([^\'")]+\.woff2)[\'"]?\s*\)')
+
+def baseline_rev():
+    """The parent of the commit that stopped linking cdnjs."""
+    rev = subprocess.run(
+        ['git', 'log', '-1', '--format=%H', '-S', 'cdnjs.cloudflare.com', '--', 'templates/index.html'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return f'{rev}^' if rev else 'HEAD'
+
+def local_equivalent(url):
+    for prefix, local in CDN_EQUIVALENTS.items():
+        if url.startswith(prefix):
+            return local + url[len(prefix):]
+    return url
+
+def used_fonts(css, css_url):
+    """Font files a browser downloads: Font Awesome solid only, everything from a build."""
+    fonts = []
+    for ref in CSS_FONT_URL.findall(css):
+        url = urljoin(css_url, ref)
+        if url.startswith('/static/dist/') or 'fa-solid-900' in url:
+            fonts.append(url)
+    return list(dict.fromkeys(fonts))
+
+class Browser:
+    def __init__(self, client):
+        self.client = client
+        self.cache = {}
+
+    def get(self, url):
+        """Return (body, requests made, bytes transferred, gzipped bytes transferred)."""
+        local = local_equivalent(url)
+        cached = self.cache.get(url)
+        if cached and cached['fresh']:
+            return cached['body'], 0, 0, 0
+        if urlparse(local).scheme:
+            # External and not measurable offline; Google Fonts CSS is cached for a day
+            self.cache[url] = {'body': '', 'fresh': True}
+            return '', 1, 0, 0
+
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        response = self.client.get(local, headers=headers)
+        if response.status_code == 304:
+            return cached['body'], 1, 0, 0
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {local} returned {response.status_code}")
+
+        data = response.get_data()
+        external = local != url
+        cache_control = response.cache_control
+        self.cache[url] = {
+            'body': data.decode('utf-8', 'replace'),
+            'fresh': external or (bool(cache_control.max_age)
+                                  and not cache_control.no_cache and not cache_control.no_store),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        return self.cache[url]['body'], 1, len(data), len(gzip.compress(data))
+
+    def load(self, path):
+        html, requests, size, gzipped = self.get(path)
+        for match in TAG_URL.finditer(html):
+            url = next(group for group in match.groups() if group).replace('&amp;', '&')
+            body, *counts = self.get(url)
+            requests, size, gzipped = requests + counts[0], size + counts[1], gzipped + counts[2]
+            if url.endswith('.css'):
+                for font in used_fonts(body, url):
+                    _, *counts = self.get(font)
+                    requests, size, gzipped = requests + counts[0], size + counts[1], gzipped + counts[2]
+        return requests, size, gzipped
+
+def measure(app, pages):
+    results = {}
+    for template, path in pages.items():
+        browser = Browser(app.test_client())
+        results[template] = (browser.load(path), browser.load(path))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--before-rev', help='git revision with the CDN templates (default: found from history)')
+    args = parser.parse_args()
+
+    import app as chiron
+    import assets
+    from jinja2 import FileSystemLoader
+
+    rev = args.before_rev or baseline_rev()
+    template_dir = tempfile.mkdtemp()
+    for template in PAGES:
+        source = subprocess.run(['git', 'show', f'{rev}:templates/{template}'], cwd=ROOT,
+                                capture_output=True, check=True).stdout
+        with open(os.path.join(template_dir, template), 'wb') as f:
+            f.write(source)
+
+    flask_app = chiron.app
+    after_hooks = flask_app.after_request_funcs[None]
+    flask_app.jinja_env.loader = FileSystemLoader(template_dir)
+    flask_app.after_request_funcs[None] = [f for f in after_hooks if f is not assets.add_cache_headers]
+    before = measure(flask_app, PAGES)
+
+    flask_app.jinja_env.loader = FileSystemLoader(os.path.join(ROOT, 'templates'))
+    flask_app.jinja_env.cache.clear()
+    flask_app.after_request_funcs[None] = after_hooks
+    after = measure(flask_app, PAGES)
+
+    print(f"before = {rev}, after = working tree"
+          f" ({'built' if assets.load_manifest() else 'not built: run build_assets.py'})")
+    print(f"{'page':<30}{'':>7}{'cold reqs':>10}{'cold KB':>10}{'gzip KB':>9}{'warm reqs':>11}{'warm KB':>9}")
+    for template in PAGES:
+        for label, results in (('before', before), ('after', after)):
+            (cold_reqs, cold, cold_gz), (warm_reqs, warm, _) = results[template]
+            print(f"{template if label == 'before' else '':<30}{label:>7}{cold_reqs:>10}"
+                  f"{cold / 1024:>10.1f}{cold_gz / 1024:>9.1f}{warm_reqs:>11}{warm / 1024:>9.1f}")
+
+if __name__ == '__main__':
+    main()
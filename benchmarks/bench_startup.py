@@ -0,0 +1,130 @@
+"""
+Track app import time and per-worker memory so startup regressions show up.
+
+Import time comes from `python -X importtime -c "import app"`. Memory is read
+from /proc/<pid>/smaps_rollup (Linux only) for a gunicorn started with
+gunicorn.conf.py, once with preloading and once without, after each worker
+has served requests that load groq and geopy. Run from the repo root:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --max-import-ms 400   # exit 1 if slower
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)')
+
+def measure_import(runs):
+    """Return the median cumulative import time of app and its direct imports, in ms."""
+    totals = []
+    children = {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import app'],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+            env=dict(os.environ, CHIRON_CACHE_WARM='0')
+        )
+        # Output is in completion order: app's direct imports are the depth-1
+        # lines between the previous top-level import and app itself
+        direct = {}
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if not match:
+                continue
+            cumulative_ms = int(match.group(2)) / 1000
+            depth = len(match.group(3)) // 2
+            if depth == 1:
+                direct[match.group(4)] = cumulative_ms
+            elif depth == 0 and match.group(4) == 'app':
+                totals.append(cumulative_ms)
+                for name, ms in direct.items():
+                    children.setdefault(name, []).append(ms)
+            elif depth == 0:
+                direct = {}
+    top = sorted(((statistics.median(times), name) for name, times in children.items()), reverse=True)
+    return statistics.median(totals), top[:8]
+
+def read_memory(pid):
+    """Return RSS, PSS and USS (private memory) of a process in MB."""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    uss = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    return fields['Rss'], fields['Pss'], uss
+
+def worker_pids(master_pid):
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+def measure_workers(preload, port, workers):
+    env = dict(os.environ, CHIRON_PRELOAD='1' if preload else '0', CHIRON_CACHE_WARM='0', GROQ_API_KEY='')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), 'app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        start = time.perf_counter()
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=1).read()
+                break
+            except OSError:
+                if time.perf_counter() - start > 30:
+                    raise RuntimeError("gunicorn did not start")
+                time.sleep(0.05)
+        ready_seconds = time.perf_counter() - start
+
+        # Exercise the lazily imported code paths; concurrent requests spread
+        # across the workers
+        request = urllib.request.Request(
+            f'http://127.0.0.1:{port}/symptom-checker', data=b'{"symptoms": "fever"}',
+            headers={'Content-Type': 'application/json'}
+        )
+        with ThreadPoolExecutor(max_workers=workers * 2) as executor:
+            list(executor.map(lambda _: urllib.request.urlopen(request, timeout=10).read(), range(workers * 20)))
+
+        master = read_memory(server.pid)
+        per_worker = [read_memory(pid) for pid in worker_pids(server.pid)]
+        return ready_seconds, master, per_worker
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='import timing runs (median is reported)')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-import-ms', type=float, help='fail if importing app takes longer')
+    args = parser.parse_args()
+
+    total, top = measure_import(args.runs)
+    print(f"import app: {total:.0f} ms (median of {args.runs})")
+    for cumulative, name in top:
+        print(f"  {name:<28} {cumulative:7.1f} ms")
+
+    for preload in (False, True):
+        ready, master, per_worker = measure_workers(preload, args.port, args.workers)
+        rss, pss, uss = (statistics.mean(values) for values in zip(*per_worker))
+        print(f"preload={'on' if preload else 'off':<3}: first response after {ready:.2f}s, "
+              f"master RSS {master[0]:.1f} MB, per worker RSS {rss:.1f} / PSS {pss:.1f} / USS {uss:.1f} MB, "
+              f"total PSS {master[1] + pss * len(per_worker):.1f} MB")
+
+    if args.max_import_ms and total > args.max_import_ms:
+        print(f"Import time {total:.0f} ms exceeds budget of {args.max_import_ms:.0f} ms", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""
+Build self-hosted, fingerprinted static assets into static/dist.
+
+For every bundle in assets.BUNDLES the sources are concatenated and minified,
+fonts and images they reference are copied next to them, and the result is
+written under a content-hashed name listed in static/dist/manifest.json:
+
+- Font Awesome is cut down to the icons that appear in the templates and
+  scripts, and its font is subset to match (needs fontTools).
+- Poppins is downloaded from Google Fonts (latin glyphs only). If that fails,
+  the bundle keeps linking Google Fonts and the rest is still built.
+
+Usage:
+    python build_assets.py
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import posixpath
+import urllib.request
+from io import BytesIO
+from typing import Dict, List, Set, Tuple
+from urllib.parse import urljoin, urlparse
+
+import rcssmin
+import rjsmin
+
+from assets import BUNDLES, DIST_DIR, MANIFEST_PATH, STATIC_DIR
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.path.join(ROOT, 'templates')
+SCRIPT_DIR = os.path.join(STATIC_DIR, 'js')
+
+# Google Fonts serves woff2 with per-script unicode ranges only to modern browsers
+FONT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+POPPINS_SUBSETS = ('latin',)
+
+CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+FA_GLYPH_SELECTOR = re.compile(r'^\.fa-([a-z0-9-]+)(?:::?before)?$')
+FA_GLYPH_BODY = re.compile(r'^(?:content|--fa):\s*"\\([0-9a-f]+)";?$')
+FA_FONT_FILE = re.compile(r'(fa-[a-z0-9-]+)\.(?:woff2|ttf)')
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:10]
+
+def fetch(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={'User-Agent': FONT_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+def read_source(source: str) -> bytes:
+    """Read a bundle source: an absolute URL, or a /static path on disk."""
+    if urlparse(source).scheme:
+        return fetch(source)
+    with open(os.path.join(ROOT, source.lstrip('/')), 'rb') as f:
+        return f.read()
+
+def split_rules(css: str) -> List[Tuple[str, str]]:
+    """Split a stylesheet into top-level (prelude, body) pairs; bodies may contain nested blocks."""
+    rules = []
+    depth = 0
+    start = 0
+    body_start = 0
+    prelude = ''
+    for i, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                prelude = css[start:i].strip()
+                body_start = i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[body_start:i].strip()))
+                start = i + 1
+    return rules
+
+def join_rules(rules: List[Tuple[str, str]]) -> str:
+    return ''.join(f'{prelude}{{{body}}}' for prelude, body in rules)
+
+def used_icon_names() -> Set[str]:
+    """
+    Font Awesome icon names the pages may use: every `fa-*` class in the
+    templates and scripts, plus quoted strings in the scripts, which covers
+    names assembled in JavaScript such as `fa-${icon}`.
+    """
+    names = set()
+    for directory in (TEMPLATE_DIR, SCRIPT_DIR):
+        for filename in os.listdir(directory):
+            with open(os.path.join(directory, filename), encoding='utf-8') as f:
+                text = f.read()
+            names.update(re.findall(r'\bfa-([a-z0-9-]+)', text))
+            if directory == SCRIPT_DIR:
+                names.update(re.findall(r'[\'"`]([a-z0-9-]+)[\'"`]', text))
+    return names
+
+def subset_font_awesome(css: str, icons: Set[str]) -> Tuple[str, Set[int]]:
+    """
+    Drop icon rules that no page uses and @font-face rules for unused styles.
+    Returns the CSS and the codepoints of the icons kept.
+    """
+    used_styles = {'fa-solid-900'}
+    if icons & {'regular'}:
+        used_styles.add('fa-regular-400')
+    if icons & {'brands'}:
+        used_styles.add('fa-brands-400')
+
+    rules = []
+    codepoints = set()
+    for prelude, body in split_rules(css):
+        if prelude == '@font-face':
+            font_files = set(FA_FONT_FILE.findall(body))
+            if font_files and not font_files & used_styles:
+                continue
+        glyph = FA_GLYPH_BODY.match(body)
+        if glyph:
+            selectors = [s.strip() for s in prelude.split(',')]
+            names = [FA_GLYPH_SELECTOR.match(s) for s in selectors]
+            if all(names):
+                kept = [s for s, name in zip(selectors, names) if name.group(1) in icons]
+                if not kept:
+                    continue
+                prelude = ','.join(kept)
+                codepoints.add(int(glyph.group(1), 16))
+        rules.append((prelude, body))
+
+    # Only ship woff2; every browser that supports the rest of this CSS reads it
+    subset_css = re.sub(r',\s*url\([^)]*\.ttf\)\s*format\("truetype"\)', '', join_rules(rules))
+    return subset_css, codepoints
+
+def subset_font(data: bytes, codepoints: Set[int]) -> bytes:
+    """Subset a font to the given codepoints, or return it unchanged without fontTools."""
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        print("fontTools is not installed; Font Awesome fonts are copied unsubset", file=sys.stderr)
+        return data
+
+    font = TTFont(BytesIO(data))
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    output = BytesIO()
+    font.flavor = 'woff2'
+    font.save(output)
+    return output.getvalue()
+
+def filter_google_subsets(css: str, subsets: Tuple[str, ...]) -> str:
+    """Keep only the @font-face blocks Google labels with one of `subsets`."""
+    blocks = re.findall(r'/\*\s*([\w-]+)\s*\*/\s*(@font-face\s*\{[^}]*\})', css)
+    return ''.join(block for label, block in blocks if label in subsets)
+
+def collect_urls(css: str, base: str, files: Dict[str, bytes], transform=None) -> str:
+    """
+    Copy every file referenced by url() into `files` and point the reference
+    at the bundle's asset directory (filled in once it is hashed).
+    """
+    def replace(match):
+        ref = match.group(2)
+        if ref.startswith(('data:', '#')):
+            return match.group(0)
+        source = urljoin(base, ref)
+        parsed = urlparse(source)
+        filename = posixpath.basename(parsed.path)
+        if filename not in files:
+            data = read_source(parsed.path if parsed.scheme == 'file' else source)
+            files[filename] = transform(filename, data) if transform else data
+        return f'url(__ASSET_DIR__/{filename})'
+    return CSS_URL.sub(replace, css)
+
+def build_css(name: str, sources: List[str], icons: Set[str]):
+    """Return (external URLs kept as links, minified CSS, referenced files)."""
+    external = []
+    parts = []
+    files: Dict[str, bytes] = {}
+    for source in sources:
+        try:
+            css = read_source(source).decode('utf-8')
+        except OSError as e:
+            print(f"{name}: could not fetch {source} ({str(e)}); linking it directly", file=sys.stderr)
+            external.append(source)
+            continue
+
+        transform = None
+        if 'fonts.googleapis.com' in source:
+            css = filter_google_subsets(css, POPPINS_SUBSETS)
+        elif 'fontawesome' in source:
+            css, codepoints = subset_font_awesome(css, icons)
+            transform = lambda filename, data: subset_font(data, codepoints)
+
+        base = source if urlparse(source).scheme else 'file://' + source
+        try:
+            parts.append(collect_urls(css, base, files, transform))
+        except OSError as e:
+            print(f"{name}: could not fetch files for {source} ({str(e)}); linking it directly", file=sys.stderr)
+            external.append(source)
+    return external, rcssmin.cssmin('\n'.join(parts)), files
+
+def write_dist(relative_path: str, data: bytes):
+    path = os.path.join(DIST_DIR, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def hashed_name(name: str, data: bytes) -> str:
+    stem, ext = os.path.splitext(posixpath.basename(name))
+    return f'{stem}.{content_hash(data)}{ext}'
+
+def build() -> Dict[str, List[str]]:
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+
+    icons = used_icon_names()
+    manifest = {}
+    for name, sources in BUNDLES.items():
+        if name.endswith('.css'):
+            external, css, files = build_css(name, sources, icons)
+            if files:
+                asset_dir = posixpath.splitext(posixpath.basename(name))[0] + '-' + content_hash(
+                    b''.join(filename.encode('utf-8') + data for filename, data in sorted(files.items()))
+                )
+                for filename, data in files.items():
+                    write_dist(f'{asset_dir}/{filename}', data)
+                css = css.replace('__ASSET_DIR__', f'/static/dist/{asset_dir}')
+            data = css.encode('utf-8')
+        else:
+            external = []
+            data = rjsmin.jsmin(
+                '\n'.join(read_source(source).decode('utf-8') for source in sources),
+                keep_bang_comments=True
+            ).encode('utf-8')
+
+        urls = list(external)
+        if data.strip():
+            filename = hashed_name(name, data)
+            write_dist(filename, data)
+            urls.append(f'/static/dist/{filename}')
+        manifest[name] = urls
+        print(f"{name}: {', '.join(urls)} ({len(data)} bytes)")
+
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+if __name__ == '__main__':
+    build()
@@ -0,0 +1,302 @@
+import os
+import json
+import time
+import sqlite3
+import contextlib
+import hashlib
+import inspect
+import tempfile
+import threading
+import functools
+from typing import Any, Callable, Dict, List, Optional
+
+CACHE_DB_PATH = os.getenv('CHIRON_CACHE_DB', os.path.join(tempfile.gettempdir(), 'chiron_cache.sqlite3'))
+LLM_CACHE_TTL = int(os.getenv('CHIRON_LLM_CACHE_TTL', str(24 * 3600)))
+GEOCODE_CACHE_TTL = int(os.getenv('CHIRON_GEOCODE_CACHE_TTL', str(30 * 24 * 3600)))
+FACILITY_CACHE_TTL = int(os.getenv('CHIRON_FACILITY_CACHE_TTL', str(7 * 24 * 3600)))
+
+# Arguments of a cached call (symptoms, medications, addresses) are only kept
+# once this many requests have made the same call, so the warmer can replay
+# common queries without storing one person's inputs. Access counts and
+# statistics are deleted once they are older than their retention period.
+ACCESS_MIN_COUNT = int(os.getenv('CHIRON_CACHE_ACCESS_MIN_COUNT', '5'))
+ACCESS_RETENTION = int(os.getenv('CHIRON_CACHE_ACCESS_RETENTION', str(7 * 24 * 3600)))
+STATS_RETENTION = int(os.getenv('CHIRON_CACHE_STATS_RETENTION', str(30 * 24 * 3600)))
+
+# Hit/miss counters are kept per namespace and per minute
+STATS_BUCKET_SECONDS = 60
+
+class SQLiteCache:
+    """
+    Key-value cache with expiry, stored in a SQLite file shared by all gunicorn
+    workers.
+
+    Besides the values it records how often each cached call is made, by
+    hashed key, so the cache warmer can find the most popular queries, and
+    hit/miss counts per minute for reporting. The database is readable only
+    by its owner.
+    """
+
+    def __init__(self, db_path: str = CACHE_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return a connection owned by the calling thread and process."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self):
+        try:
+            # Create the file private to its owner before SQLite opens it;
+            # SQLite gives the -wal and -shm files the same permissions
+            os.close(os.open(self.db_path, os.O_CREAT | os.O_RDWR, 0o600))
+            os.chmod(self.db_path, 0o600)
+        except OSError as e:
+            print(f"Could not restrict permissions on {self.db_path}: {str(e)}")
+        with contextlib.closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS access (
+                    key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    last_seen REAL NOT NULL,
+                    args TEXT
+                );
+                CREATE TABLE IF NOT EXISTS stats (
+                    namespace TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    misses INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (namespace, bucket)
+                );
+                CREATE TABLE IF NOT EXISTS deploys (
+                    started_at REAL PRIMARY KEY
+                );
+            """)
+
+    @staticmethod
+    def make_key(namespace: str, args: Any) -> str:
+        raw = json.dumps(args, sort_keys=True)
+        return f"{namespace}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connect().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time() + ttl)
+        )
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store `value` only if `key` is absent or expired; return True if it was stored."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute("DELETE FROM cache WHERE key = ? AND expires_at < ?", (key, now))
+            stored = conn.execute(
+                "INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), now + ttl)
+            ).rowcount == 1
+            conn.execute('COMMIT')
+            return stored
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def renew(self, key: str, value: Any, ttl: float) -> bool:
+        """Extend an unexpired entry's lifetime if it still holds `value`; return True if it did."""
+        now = time.time()
+        return self._connect().execute(
+            "UPDATE cache SET expires_at = ? WHERE key = ? AND value = ? AND expires_at >= ?",
+            (now + ttl, key, json.dumps(value), now)
+        ).rowcount == 1
+
+    def record_access(self, namespace: str, key: str, args: Any, hit: bool):
+        """
+        Count a call by its key and record a hit or miss. `args` is stored only
+        once the call has been made ACCESS_MIN_COUNT times.
+        """
+        now = time.time()
+        bucket = int(now // STATS_BUCKET_SECONDS) * STATS_BUCKET_SECONDS
+        raw_args = json.dumps(args, sort_keys=True)
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO access (key, namespace, count, last_seen, args) "
+            "VALUES (?, ?, 1, ?, CASE WHEN ? <= 1 THEN ? END) "
+            "ON CONFLICT (key) DO UPDATE SET count = count + 1, last_seen = excluded.last_seen, "
+            "args = CASE WHEN count + 1 >= ? THEN ? END",
+            (key, namespace, now, ACCESS_MIN_COUNT, raw_args, ACCESS_MIN_COUNT, raw_args)
+        )
+        conn.execute(
+            "INSERT INTO stats (namespace, bucket, hits, misses) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (namespace, bucket) DO UPDATE SET "
+            "hits = hits + excluded.hits, misses = misses + excluded.misses",
+            (namespace, bucket, int(hit), int(not hit))
+        )
+
+    def popular(self, namespace: str, limit: int) -> List[Any]:
+        """
+        Return the arguments of the `limit` most frequently requested calls in a
+        namespace, among those made at least ACCESS_MIN_COUNT times.
+        """
+        rows = self._connect().execute(
+            "SELECT args FROM access WHERE namespace = ? AND args IS NOT NULL AND last_seen >= ? "
+            "ORDER BY count DESC, last_seen DESC LIMIT ?",
+            (namespace, time.time() - ACCESS_RETENTION, limit)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def hit_rate(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Summarise hits and misses per namespace between two timestamps."""
+        # Include the bucket `since` falls in
+        since = since - since % STATS_BUCKET_SECONDS if since else 0
+        rows = self._connect().execute(
+            "SELECT namespace, SUM(hits), SUM(misses) FROM stats WHERE bucket >= ? AND bucket < ? GROUP BY namespace",
+            (since, until or float('inf'))
+        ).fetchall()
+        return {
+            namespace: {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+            }
+            for namespace, hits, misses in rows
+        }
+
+    def record_deploy(self):
+        """
+        Record that the server has started. Uses its own short-lived connection
+        so nothing is left open when gunicorn forks workers.
+        """
+        with contextlib.closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            conn.execute("INSERT OR IGNORE INTO deploys (started_at) VALUES (?)", (time.time(),))
+            conn.commit()
+
+    def latest_deploy(self) -> Optional[float]:
+        """Return when the server last started, if it has recorded it."""
+        return self._connect().execute("SELECT MAX(started_at) FROM deploys").fetchone()[0]
+
+    def first_access(self) -> Optional[float]:
+        """Return the start of the earliest statistics bucket, i.e. roughly when traffic began."""
+        row = self._connect().execute("SELECT MIN(bucket) FROM stats").fetchone()
+        return row[0]
+
+    def purge_expired(self) -> Dict[str, int]:
+        """Delete expired values, and access counts, statistics and deploy times past their retention."""
+        now = time.time()
+        conn = self._connect()
+        return {
+            'cache': conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,)).rowcount,
+            'access': conn.execute("DELETE FROM access WHERE last_seen < ?", (now - ACCESS_RETENTION,)).rowcount,
+            'stats': conn.execute("DELETE FROM stats WHERE bucket < ?", (now - STATS_RETENTION,)).rowcount,
+            'deploys': conn.execute(
+                "DELETE FROM deploys WHERE started_at < ? AND started_at < (SELECT MAX(started_at) FROM deploys)",
+                (now - STATS_RETENTION,)
+            ).rowcount,
+        }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> SQLiteCache:
+    """Return the shared cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SQLiteCache()
+        return _cache
+
+def _normalize(value: Any) -> Any:
+    """Lower-case and trim strings so trivially different queries share a cache entry."""
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+def cached(namespace: str, ttl: float, ignore: tuple = ('client',)) -> Callable:
+    """
+    Cache a function's result under `namespace`, keyed by its arguments with
+    strings normalised. `None` results are not cached so failed upstream calls are
+    retried. Arguments named in `ignore` do not affect the key.
+
+    Callers can pass `use_cache=False` to call through without reading or
+    storing anything, or `record=False` to use the cache without counting the
+    call towards popularity or hit statistics (e.g. batch runs).
+
+    The wrapped function also gets `refresh` (always call through and store the
+    result), `peek` (return the cached value or None) and `is_cached`. None of
+    them touch the hit statistics, so the cache warmer can use them freely.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def cache_args(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return {name: _normalize(value) for name, value in bound.arguments.items() if name not in ignore}
+
+        @functools.wraps(func)
+        def wrapper(*args, use_cache: bool = True, record: bool = True, **kwargs):
+            if not use_cache:
+                return func(*args, **kwargs)
+            key_args = cache_args(args, kwargs)
+            try:
+                cache = get_cache()
+                key = cache.make_key(namespace, key_args)
+                value = cache.get(key)
+                if record:
+                    cache.record_access(namespace, key, key_args, hit=value is not None)
+            except sqlite3.Error as e:
+                print(f"Cache error: {str(e)}")
+                return func(*args, **kwargs)
+
+            if value is not None:
+                return value
+            value = func(*args, **kwargs)
+            if value is not None:
+                try:
+                    cache.set(key, value, ttl)
+                except sqlite3.Error as e:
+                    print(f"Cache error: {str(e)}")
+            return value
+
+        def refresh(*args, **kwargs):
+            key_args = cache_args(args, kwargs)
+            value = func(*args, **kwargs)
+            if value is not None:
+                cache = get_cache()
+                cache.set(cache.make_key(namespace, key_args), value, ttl)
+            return value
+
+        def peek(*args, **kwargs):
+            cache = get_cache()
+            return cache.get(cache.make_key(namespace, cache_args(args, kwargs)))
+
+        def is_cached(*args, **kwargs) -> bool:
+            return peek(*args, **kwargs) is not None
+
+        wrapper.refresh = refresh
+        wrapper.peek = peek
+        wrapper.is_cached = is_cached
+        wrapper.namespace = namespace
+        return wrapper
+    return decorator
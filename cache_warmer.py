@@ -0,0 +1,266 @@
+"""
+Background cache warmer for LLM, geocoding and facility lookups.
+
+Each cycle purges expired cache rows and old access records, then collects
+the most popular queries recorded by the cache. Only calls made often enough
+for their arguments to be kept count as popular. It tops them up from a
+configured list (and, for drug pairs, from the local interaction database),
+and fills any entries that are missing. Upstream calls are spaced out to stay
+within Groq, Nominatim and Overpass rate limits.
+
+Usage:
+    python cache_warmer.py warm             # run one warm-up cycle now
+    python cache_warmer.py stats            # hit rate for the first hour after the latest deploy
+    python cache_warmer.py stats --minutes 30 --since 1760000000
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import itertools
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from cache import get_cache
+from rate_limit import RateLimiter
+from symptom_checker import get_disease_from_symptoms
+from DrugInteraction import DrugInteractionChecker, get_ai_drug_interaction
+from Personalised_Medication import get_personalized_medication
+from hospital_locator import geocode_address, find_facilities, to_tile
+
+CACHE_WARM_ENABLED = os.getenv('CHIRON_CACHE_WARM', '1') == '1'
+CACHE_WARM_INTERVAL = int(os.getenv('CHIRON_CACHE_WARM_INTERVAL', str(6 * 3600)))
+CACHE_WARM_TOP_N = int(os.getenv('CHIRON_CACHE_WARM_TOP_N', '20'))
+CACHE_WARM_CONFIG = os.getenv('CHIRON_CACHE_WARM_CONFIG')
+
+# Held while a cycle runs so workers do not warm the same entries at once.
+# Later cycles in other workers only find cached entries and make no calls.
+# A cold cycle takes longer than this, so the lock is renewed before every
+# upstream call; the TTL only needs to outlast one rate-limited call.
+WARM_LOCK_KEY = 'cache-warmer:lock'
+WARM_LOCK_TTL = 5 * 60
+
+# Requests per minute allowed to each upstream service while warming. These
+# sit well below the providers' limits so live traffic keeps its headroom.
+UPSTREAM_RATES = {
+    'groq': 10,
+    'nominatim': 30,  # Nominatim's usage policy allows at most 1 request/second
+    'overpass': 6,
+}
+
+DEFAULT_WARM_LIST = {
+    'symptoms': [
+        'fever, cough, fatigue',
+        'headache, nausea',
+        'sore throat, runny nose',
+        'stomach pain, diarrhea',
+    ],
+    'conditions': [
+        'hypertension',
+        'type 2 diabetes',
+        'migraine',
+        'common cold',
+        'acid reflux',
+    ],
+    'drug_pairs': [],
+    'locations': [
+        'Bangalore',
+        'Mumbai',
+        'Delhi',
+        'Chennai',
+        'Hyderabad',
+    ],
+    'radius': 5000,
+}
+
+def load_warm_list() -> Dict[str, Any]:
+    """Return the configured warm list, falling back to the built-in defaults."""
+    warm_list = dict(DEFAULT_WARM_LIST)
+    if CACHE_WARM_CONFIG:
+        try:
+            with open(CACHE_WARM_CONFIG, encoding='utf-8') as f:
+                warm_list.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Could not read cache warm config {CACHE_WARM_CONFIG}: {str(e)}")
+    return warm_list
+
+def _merge(popular: List[Dict], configured: List[Dict], limit: int) -> List[Dict]:
+    """Popular entries first, then configured ones, without duplicates."""
+    merged = []
+    for args in itertools.chain(popular, configured):
+        if args not in merged:
+            merged.append(args)
+    return merged[:limit]
+
+def warm_targets(top_n: int = CACHE_WARM_TOP_N) -> Dict[str, List[Dict]]:
+    """Work out which calls to warm, as keyword arguments per cached function."""
+    cache = get_cache()
+    warm_list = load_warm_list()
+
+    checker = DrugInteractionChecker()
+    known_pairs = [
+        {'drug1': drug1, 'drug2': drug2}
+        for drug1, drug2 in itertools.combinations(checker.get_all_known_drugs(), 2)
+        if checker.check_interaction(drug1, drug2)
+    ]
+    configured_pairs = [{'drug1': pair[0], 'drug2': pair[1]} for pair in warm_list['drug_pairs']]
+
+    locations = _merge(
+        cache.popular(geocode_address.namespace, top_n),
+        [{'address': address} for address in warm_list['locations']],
+        top_n
+    )
+
+    return {
+        'symptoms': _merge(
+            cache.popular(get_disease_from_symptoms.namespace, top_n),
+            [{'symptoms': symptoms} for symptoms in warm_list['symptoms']],
+            top_n
+        ),
+        'drug_pairs': _merge(
+            cache.popular(get_ai_drug_interaction.namespace, top_n),
+            configured_pairs + known_pairs,
+            top_n
+        ),
+        'conditions': _merge(
+            cache.popular(get_personalized_medication.namespace, top_n),
+            [{'condition': condition, 'patient_allergies': [], 'current_medications': []}
+             for condition in warm_list['conditions']],
+            top_n
+        ),
+        'locations': locations,
+        'facilities': _merge(
+            cache.popular(find_facilities.namespace, top_n * 2),
+            [],
+            top_n * 2
+        ),
+        'radius': warm_list['radius'],
+    }
+
+def _warm(func, kwargs: Dict, limiter: RateLimiter, renew_lock: Optional[Callable[[], None]]) -> bool:
+    """Fill one cache entry if it is missing; return True if an upstream call was made."""
+    if func.is_cached(**kwargs):
+        return False
+    if renew_lock:
+        renew_lock()
+    limiter.wait()
+    try:
+        func.refresh(**kwargs)
+    except Exception as e:
+        print(f"Cache warm failed for {func.namespace} {kwargs}: {str(e)}")
+    return True
+
+def warm_cycle(top_n: int = CACHE_WARM_TOP_N, rates: Dict[str, float] = None,
+               renew_lock: Optional[Callable[[], None]] = None) -> Dict[str, int]:
+    """
+    Run one warm-up pass and return the number of upstream calls per service.
+    `renew_lock` is called before every upstream call and should raise if the
+    caller no longer holds the warm lock.
+    """
+    rates = rates or UPSTREAM_RATES
+    # Each cycle also clears out expired entries and old access records
+    try:
+        purged = get_cache().purge_expired()
+        print(f"Cache purge removed {purged}")
+    except sqlite3.Error as e:
+        print(f"Cache purge failed: {str(e)}")
+
+    limiters = {service: RateLimiter(rate) for service, rate in rates.items()}
+    targets = warm_targets(top_n)
+    calls = {service: 0 for service in limiters}
+
+    # Locations first: map lookups are the slowest for cold users
+    for kwargs in targets['locations']:
+        calls['nominatim'] += _warm(geocode_address, kwargs, limiters['nominatim'], renew_lock)
+        location = geocode_address.peek(**kwargs)
+        if not location:
+            continue
+        lat, lon = to_tile(location['lat'], location['lon'])
+        for amenity in ('hospital', 'pharmacy'):
+            facility_kwargs = {'lat': lat, 'lon': lon, 'radius': targets['radius'], 'amenity': amenity}
+            calls['overpass'] += _warm(find_facilities, facility_kwargs, limiters['overpass'], renew_lock)
+
+    for kwargs in targets['facilities']:
+        calls['overpass'] += _warm(find_facilities, kwargs, limiters['overpass'], renew_lock)
+
+    for func, key in ((get_ai_drug_interaction, 'drug_pairs'),
+                      (get_disease_from_symptoms, 'symptoms'),
+                      (get_personalized_medication, 'conditions')):
+        for kwargs in targets[key]:
+            calls['groq'] += _warm(func, kwargs, limiters['groq'], renew_lock)
+
+    return calls
+
+_warmer_pid = None
+_warmer_lock = threading.Lock()
+
+def locked_warm_cycle(top_n: int = CACHE_WARM_TOP_N) -> Optional[Dict[str, int]]:
+    """
+    Run a warm-up cycle while holding the cross-process warm lock, so only one
+    cycle calls upstream services at a time. Returns None if another process
+    holds the lock.
+    """
+    cache = get_cache()
+    owner = os.getpid()
+    if not cache.add(WARM_LOCK_KEY, owner, ttl=WARM_LOCK_TTL):
+        return None
+
+    def renew_lock():
+        if not cache.renew(WARM_LOCK_KEY, owner, WARM_LOCK_TTL):
+            raise RuntimeError("Lost the cache warm lock to another process")
+
+    return warm_cycle(top_n, renew_lock=renew_lock)
+
+def _warm_forever():
+    while True:
+        try:
+            calls = locked_warm_cycle()
+            if calls is not None:
+                print(f"Cache warm cycle finished: {calls}")
+        except Exception as e:
+            print(f"Cache warmer error: {str(e)}")
+        time.sleep(CACHE_WARM_INTERVAL)
+
+def start_cache_warmer():
+    """Start the background warmer in this process, once (also after a fork)."""
+    global _warmer_pid
+    if not CACHE_WARM_ENABLED:
+        return
+    with _warmer_lock:
+        if _warmer_pid == os.getpid():
+            return
+        _warmer_pid = os.getpid()
+        threading.Thread(target=_warm_forever, name='cache-warmer', daemon=True).start()
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the Chiron caches or report their hit rate.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    warm_parser = subparsers.add_parser('warm', help="Run one warm-up cycle now")
+    warm_parser.add_argument('--top-n', type=int, default=CACHE_WARM_TOP_N)
+    stats_parser = subparsers.add_parser('stats', help="Report cache hit rate per namespace")
+    stats_parser.add_argument('--since', type=float,
+                              help="Start of the window (Unix time); defaults to the latest deploy")
+    stats_parser.add_argument('--minutes', type=float, default=60)
+    args = parser.parse_args()
+
+    if args.command == 'warm':
+        calls = locked_warm_cycle(args.top_n)
+        if calls is None:
+            print("Another process is already warming the cache.", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(calls))
+        return
+
+    cache = get_cache()
+    # Fall back to the first recorded traffic when no deploy has been recorded,
+    # e.g. when the app was only run with `python app.py`
+    since = args.since or cache.latest_deploy() or cache.first_access()
+    if since is None:
+        print("No cache traffic recorded yet.", file=sys.stderr)
+        return
+    print(json.dumps(cache.hit_rate(since, since + args.minutes * 60), indent=2))
+
+if __name__ == '__main__':
+    main()
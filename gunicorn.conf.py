@@ -1,3 +1,29 @@
+import os
+
 workers = 4
 timeout = 120
 bind = "0.0.0.0:8000"
+
+# Load the app once in the master and fork workers from it, so imported
+# libraries and read-only data are shared copy-on-write. Set CHIRON_PRELOAD=0
+# to have each worker import the app itself (e.g. with --reload).
+preload_app = os.getenv('CHIRON_PRELOAD', '1') == '1'
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before workers are forked
+    import sqlite3
+    from cache import get_cache
+    try:
+        # Cache hit rates are reported from this point by `cache_warmer.py stats`
+        get_cache().record_deploy()
+    except sqlite3.Error as e:
+        print(f"Could not record deploy time: {str(e)}")
+
+    if server.cfg.preload_app:
+        from app import preload_shared_state
+        preload_shared_state()
+
+def post_worker_init(worker):
+    # Start warming caches as soon as each worker boots, not on its first request
+    from cache_warmer import start_cache_warmer
+    start_cache_warmer()
@@ -0,0 +1,66 @@
+from typing import Dict, List, Optional
+from cache import cached, GEOCODE_CACHE_TTL, FACILITY_CACHE_TTL
+
+# Facility searches are cached per tile: coordinates are rounded to this many
+# decimal places (about 110 m), so nearby searches share one Overpass result.
+TILE_PRECISION = 3
+
+@cached('geocode', GEOCODE_CACHE_TTL)
+def geocode_address(address: str) -> Optional[Dict]:
+    """Geocode an address in India and return its coordinates and display name."""
+    from geopy.geocoders import Nominatim
+
+    # Initialize geocoder with a longer timeout and user agent
+    geolocator = Nominatim(
+        user_agent="chiron_healthcare_assistant",
+        timeout=10
+    )
+
+    # Get user's location with more specific parameters
+    location = geolocator.geocode(
+        address,
+        exactly_one=True,
+        language="en",
+        country_codes="in"  # Limit to India
+    )
+    if not location:
+        return None
+
+    return {
+        'lat': location.latitude,
+        'lon': location.longitude,
+        'address': location.address
+    }
+
+def to_tile(lat: float, lon: float):
+    """Round coordinates to the facility cache tile they fall in."""
+    return round(lat, TILE_PRECISION), round(lon, TILE_PRECISION)
+
+@cached('facilities', FACILITY_CACHE_TTL)
+def find_facilities(lat: float, lon: float, radius: int, amenity: str) -> List[Dict]:
+    """
+    Query Overpass for nodes with the given amenity tag around a point.
+    Callers should pass tile coordinates from `to_tile` so results are shared.
+    """
+    import overpy
+
+    api = overpy.Overpass()
+
+    query = f"""
+    [out:json][timeout:25];
+    (
+      node["amenity"="{amenity}"](around:{radius},{lat},{lon});
+      way["amenity"="{amenity}"](around:{radius},{lat},{lon});
+    );
+    out body;
+    >;
+    out skel qt;
+    """
+
+    result = api.query(query)
+    print(f"Found {len(result.nodes)} {amenity} nodes and {len(result.ways)} {amenity} ways")
+
+    return [
+        {'lat': float(node.lat), 'lon': float(node.lon), 'tags': dict(node.tags)}
+        for node in result.nodes
+    ]
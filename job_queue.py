@@ -0,0 +1,245 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import contextlib
+import hashlib
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional
+
+JOB_DB_PATH = os.getenv('CHIRON_JOB_DB', os.path.join(tempfile.gettempdir(), 'chiron_jobs.sqlite3'))
+JOB_WORKERS = int(os.getenv('CHIRON_JOB_WORKERS', '2'))
+MAX_QUEUED_JOBS = int(os.getenv('CHIRON_MAX_QUEUED_JOBS', '100'))
+JOB_RESULT_TTL = int(os.getenv('CHIRON_JOB_RESULT_TTL', '600'))
+
+# A job left in 'running' longer than this is assumed to belong to a dead
+# worker process and is handed out again.
+STALE_JOB_SECONDS = 300
+POLL_INTERVAL = 0.5
+# Times a worker tries to record a finished job before leaving it to go stale
+FINISH_ATTEMPTS = 3
+
+class QueueFullError(Exception):
+    """Raised when the number of queued jobs has reached the configured limit."""
+
+class JobQueue:
+    """
+    Background job queue backed by a SQLite file.
+
+    The database is shared by every gunicorn worker, so a job submitted to one
+    worker can be polled from any other. Each process runs its own small pool
+    of worker threads that claim jobs from the shared table, highest priority
+    first. Identical in-flight submissions are collapsed onto one job and
+    finished results are kept for `result_ttl` seconds.
+    """
+
+    def __init__(self, db_path: str = JOB_DB_PATH, workers: int = JOB_WORKERS,
+                 max_queued: int = MAX_QUEUED_JOBS, result_ttl: int = JOB_RESULT_TTL):
+        self.db_path = db_path
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker_pid = None
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return a connection owned by the calling thread and process."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self):
+        # A throwaway connection: the queue may be created in the gunicorn
+        # master, and SQLite connections must not be carried across a fork
+        with contextlib.closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    dedup_key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    expires_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_pending ON jobs (status, priority, created_at);
+                CREATE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs (dedup_key, status);
+            """)
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], Any]):
+        """Register the function that processes jobs of the given kind."""
+        self._handlers[kind] = handler
+
+    def _dedup_key(self, kind: str, payload: Dict[str, Any]) -> str:
+        raw = json.dumps([kind, payload], sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def submit(self, kind: str, payload: Dict[str, Any], priority: int = 0) -> Dict[str, Any]:
+        """
+        Queue a job and return its status without waiting for the result.
+        An identical job that is still queued or running is reused instead.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job type: {kind}")
+
+        now = time.time()
+        dedup_key = self._dedup_key(kind, payload)
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute("DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+
+            existing = conn.execute(
+                "SELECT id, status FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running')",
+                (dedup_key,)
+            ).fetchone()
+            if existing:
+                conn.execute('COMMIT')
+                return {'job_id': existing['id'], 'status': existing['status'], 'deduplicated': True}
+
+            queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= self.max_queued:
+                raise QueueFullError("Too many jobs are waiting. Please try again later.")
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, dedup_key, payload, priority, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+                (job_id, kind, dedup_key, json.dumps(payload), priority, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._ensure_workers()
+        self._wakeup.set()
+        return {'job_id': job_id, 'status': 'queued', 'deduplicated': False}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the current state of a job, or None if it is unknown or expired."""
+        self._ensure_workers()
+        row = self._connect().execute(
+            "SELECT * FROM jobs WHERE id = ? AND (expires_at IS NULL OR expires_at >= ?)",
+            (job_id, time.time())
+        ).fetchone()
+        if not row:
+            return None
+
+        job = {
+            'job_id': row['id'],
+            'type': row['kind'],
+            'status': row['status'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+        }
+        if row['status'] == 'queued':
+            job['position'] = self._connect().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND "
+                "(priority > ? OR (priority = ? AND created_at < ?))",
+                (row['priority'], row['priority'], row['created_at'])
+            ).fetchone()[0]
+        if row['status'] == 'done':
+            job['result'] = json.loads(row['result'])
+        if row['status'] == 'failed':
+            job['error'] = row['error']
+        return job
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Poll a job until it finishes or `timeout` seconds have passed."""
+        deadline = time.time() + timeout
+        job = self.get(job_id)
+        while job and job['status'] in ('queued', 'running') and time.time() < deadline:
+            time.sleep(min(POLL_INTERVAL, max(deadline - time.time(), 0)))
+            job = self.get(job_id)
+        return job
+
+    def _ensure_workers(self):
+        """Start this process's worker threads, once per process (also after a fork)."""
+        with self._lock:
+            if self._worker_pid == os.getpid():
+                return
+            self._worker_pid = os.getpid()
+            self._wakeup = threading.Event()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' OR (status = 'running' AND started_at < ?) "
+                "ORDER BY priority DESC, created_at LIMIT 1",
+                (now - STALE_JOB_SECONDS,)
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (now, row['id']))
+            conn.execute('COMMIT')
+            return row
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _finish(self, job_id: str, result: Any = None, error: Optional[str] = None):
+        now = time.time()
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, expires_at = ? WHERE id = ?",
+            ('failed' if error else 'done', json.dumps(result), error, now, now + self.result_ttl, job_id)
+        )
+
+    def _worker_loop(self):
+        while True:
+            try:
+                row = self._claim()
+            except sqlite3.Error as e:
+                print(f"Job queue error: {str(e)}")
+                row = None
+
+            if not row:
+                self._wakeup.wait(POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+
+            try:
+                result = self._handlers[row['kind']](json.loads(row['payload']))
+                outcome = {'result': result}
+            except ValueError as e:
+                outcome = {'error': str(e)}
+            except Exception as e:
+                print(f"Error in job {row['id']} ({row['kind']}): {str(e)}")
+                outcome = {'error': 'An error occurred while processing the request'}
+
+            # A storage error must not kill the worker thread; if every attempt
+            # fails, the job is requeued once it goes stale
+            for attempt in range(FINISH_ATTEMPTS):
+                try:
+                    self._finish(row['id'], **outcome)
+                    break
+                except sqlite3.Error as e:
+                    print(f"Job queue error finishing job {row['id']} (attempt {attempt + 1}): {str(e)}")
+                    time.sleep(POLL_INTERVAL * (attempt + 1))
+                except Exception as e:
+                    # e.g. a result that cannot be serialized; record a failure instead
+                    print(f"Error saving the result of job {row['id']}: {str(e)}")
+                    outcome = {'error': 'An error occurred while processing the request'}
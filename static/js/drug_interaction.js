@@ -0,0 +1,68 @@
+document.getElementById('submitBtn').addEventListener('click', async () => {
+    const drug1 = document.getElementById('drug1').value.trim();
+    const drug2 = document.getElementById('drug2').value.trim();
+
+    if (!drug1 || !drug2) {
+        alert('Please enter both medications to check their interaction.');
+        return;
+    }
+
+    // Show loading spinner
+    document.getElementById('loadingSpinner').style.display = 'block';
+    document.getElementById('submitBtn').disabled = true;
+    document.getElementById('resultContainer').style.display = 'none';
+
+    try {
+        const response = await fetch('/drug-interaction', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ drug1, drug2 })
+        });
+
+        const data = await response.json();
+
+        // Display database results
+        const dbResultDiv = document.getElementById('dbResult');
+        if (data.database_result) {
+            const severity = data.database_result.severity?.toLowerCase() || 'unknown';
+            dbResultDiv.className = `interaction-result ${severity}`;
+
+            let content = `
+                <div class="severity-badge ${severity}">
+                    ${severity.charAt(0).toUpperCase() + severity.slice(1)} Risk
+                </div>
+                <h3>${drug1} + ${drug2}</h3>
+                <p><strong>Effect:</strong> ${data.database_result.effect || 'No specific effect information available.'}</p>
+                <p><strong>Recommendation:</strong> ${data.database_result.recommendation || 'Consult with your healthcare provider.'}</p>
+            `;
+            dbResultDiv.innerHTML = content;
+        } else {
+            dbResultDiv.className = 'interaction-result';
+            dbResultDiv.innerHTML = `
+                <p>No known interactions found in our database between ${drug1} and ${drug2}.</p>
+                <p>However, this does not guarantee that no interactions exist.</p>
+            `;
+        }
+
+        // Display AI analysis
+        const aiContentDiv = document.getElementById('aiAnalysisContent');
+        if (data.ai_result) {
+            aiContentDiv.innerHTML = `<p>${data.ai_result}</p>`;
+        } else {
+            aiContentDiv.innerHTML = '<p>AI analysis is currently unavailable.</p>';
+        }
+
+        // Show results
+        document.getElementById('resultContainer').style.display = 'block';
+        document.getElementById('resultContainer').classList.add('visible');
+    } catch (error) {
+        console.error('Error:', error);
+        alert('An error occurred while checking drug interactions. Please try again.');
+    } finally {
+        // Hide loading spinner and enable submit button
+        document.getElementById('loadingSpinner').style.display = 'none';
+        document.getElementById('submitBtn').disabled = false;
+    }
+});
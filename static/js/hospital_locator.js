@@ -0,0 +1,204 @@
+// Initialize map container
+let map = null;
+let mapContainer = document.getElementById('map');
+let defaultCenter = [20.5937, 78.9629]; // Center of India
+let defaultZoom = 4;
+
+// Initialize empty map
+function initMap(center = defaultCenter, zoom = defaultZoom) {
+    console.log('Initializing map with center:', center, 'zoom:', zoom);
+
+    // Clean up existing map if any
+    if (map) {
+        console.log('Removing existing map');
+        map.remove();
+        map = null;
+    }
+
+    // Create new map
+    console.log('Creating new map');
+    map = L.map('map').setView(center, zoom);
+    L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+        attribution: ' OpenStreetMap contributors'
+    }).addTo(map);
+
+    return map;
+}
+
+// Create custom marker icons
+function createMarkerIcon(type) {
+    console.log('Creating marker icon for type:', type);
+    const color = type === 'hospital' ? '#27ae60' : type === 'pharmacy' ? '#3498db' : '#e74c3c';
+    const icon = type === 'hospital' ? 'hospital' : type === 'pharmacy' ? 'pills' : 'map-marker-alt';
+    const size = type === 'user' ? 24 : 20;
+
+    return L.divIcon({
+        className: 'custom-div-icon',
+        html: `<i class="fas fa-${icon}" style="color: ${color}; font-size: ${size}px;"></i>`,
+        iconSize: [size, size],
+        iconAnchor: [size/2, size/2]
+    });
+}
+
+// Format facility details for popup
+function formatFacilityDetails(facility) {
+    const details = facility.details;
+    let content = `
+        <div class="facility-popup">
+            <h4>${facility.name}</h4>
+
+            <p><span class="label">Type:</span> <span class="value">${facility.type.charAt(0).toUpperCase() + facility.type.slice(1)}</span></p>
+            <p><span class="label">Distance:</span> <span class="value">${facility.distance} km</span></p>
+
+            ${details.address !== 'Address not available' ? 
+                `<p><span class="label">Address:</span> <span class="value">${details.address}</span></p>` : ''}
+
+            ${details.phone !== 'Not available' ? 
+                `<p><span class="label">Phone:</span> <span class="value">${details.phone}</span></p>` : ''}
+
+            ${details.opening_hours !== 'Not specified' ? 
+                `<p><span class="label">Hours:</span> <span class="value">${details.opening_hours}</span></p>` : ''}
+
+            ${details.emergency !== 'Unknown' ? 
+                `<p class="emergency">Emergency: ${details.emergency === 'yes' ? 'Available 24/7' : 'Not available'}</p>` : ''}
+
+            ${details.healthcare !== 'General' ? 
+                `<p><span class="label">Specialty:</span> <span class="value">${details.healthcare}</span></p>` : ''}
+
+            ${details.wheelchair !== 'Unknown' ? 
+                `<p><span class="label">Wheelchair Access:</span> <span class="value">${details.wheelchair}</span></p>` : ''}
+
+            <div class="actions">
+                <a href="${facility.directions_url}" target="_blank">Get Directions</a>
+                ${details.website ? 
+                    `<a href="${details.website}" target="_blank" class="website" style="margin-left: 10px;">Visit Website</a>` : ''}
+            </div>
+        </div>
+    `;
+    return content;
+}
+
+// Add markers to map
+function addMarkers(data) {
+    console.log('Adding markers with data:', data);
+
+    if (!map) {
+        console.error('Map not initialized!');
+        return;
+    }
+
+    // Add user location marker with address
+    if (data.user_location && typeof data.user_location.lat === 'number' && typeof data.user_location.lon === 'number') {
+        console.log('Adding user location marker at:', data.user_location);
+        L.marker([data.user_location.lat, data.user_location.lon], {
+            icon: createMarkerIcon('user')
+        }).addTo(map).bindPopup(`
+            <div class="facility-popup">
+                <h4>Your Location</h4>
+                <p>${data.user_location.address}</p>
+            </div>
+        `);
+    } else {
+        console.error('Invalid user location:', data.user_location);
+    }
+
+    // Add facility markers
+    if (data.facilities && Array.isArray(data.facilities)) {
+        console.log('Adding', data.facilities.length, 'facility markers');
+        data.facilities.forEach((facility, index) => {
+            console.log('Processing facility:', index, facility);
+            if (facility && typeof facility.lat === 'number' && typeof facility.lon === 'number') {
+                const marker = L.marker([facility.lat, facility.lon], {
+                    icon: createMarkerIcon(facility.type)
+                });
+
+                marker.bindPopup(formatFacilityDetails(facility));
+                marker.addTo(map);
+                console.log('Added marker for facility:', facility.name);
+            } else {
+                console.error('Invalid facility coordinates:', facility);
+            }
+        });
+    } else {
+        console.error('No facilities data or invalid format:', data.facilities);
+    }
+}
+
+// Update facility statistics
+function updateStats(stats) {
+    console.log('Updating stats:', stats);
+    document.getElementById('hospitalCount').textContent = stats.hospitals || 0;
+    document.getElementById('pharmacyCount').textContent = stats.pharmacies || 0;
+}
+
+// Initialize map on page load
+document.addEventListener('DOMContentLoaded', () => {
+    console.log('Page loaded, initializing map');
+    initMap();
+});
+
+// Handle form submission
+document.getElementById('submitBtn').addEventListener('click', async () => {
+    const address = document.getElementById('address').value.trim();
+    const radius = document.getElementById('radius').value;
+
+    if (!address) {
+        alert('Please enter your location to find nearby medical facilities.');
+        return;
+    }
+
+    console.log('Searching for facilities near:', address, 'with radius:', radius);
+
+    // Show loading state
+    document.getElementById('loadingSpinner').style.display = 'block';
+    document.getElementById('submitBtn').disabled = true;
+    document.getElementById('resultContainer').style.display = 'none';
+
+    try {
+        console.log('Sending request to server...');
+        const response = await fetch('/hospital-locator', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ address, radius })
+        });
+
+        const data = await response.json();
+        console.log('Received response:', data);
+
+        if (data.error) {
+            throw new Error(data.error);
+        }
+
+        if (!data.user_location || typeof data.user_location.lat !== 'number' || typeof data.user_location.lon !== 'number') {
+            throw new Error('Invalid location data received from server');
+        }
+
+        // Update map
+        console.log('Initializing map with user location');
+        initMap([data.user_location.lat, data.user_location.lon], 14);
+
+        console.log('Adding markers to map');
+        addMarkers(data);
+
+        console.log('Updating statistics');
+        updateStats(data.stats);
+
+        // Show results
+        document.getElementById('resultContainer').style.display = 'block';
+        document.getElementById('resultContainer').classList.add('visible');
+
+    } catch (error) {
+        console.error('Error:', error);
+        alert(error.message || 'An error occurred while searching for medical facilities. Please try again.');
+
+        // Reset map to default view
+        console.log('Resetting map to default view');
+        initMap();
+    } finally {
+        // Reset loading state
+        document.getElementById('loadingSpinner').style.display = 'none';
+        document.getElementById('submitBtn').disabled = false;
+    }
+});
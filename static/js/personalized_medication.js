@@ -0,0 +1,140 @@
+class TagManager {
+    constructor(inputId, containerId) {
+        this.input = document.getElementById(inputId);
+        this.container = document.getElementById(containerId);
+        this.tags = new Set();
+
+        this.input.addEventListener('keydown', (e) => {
+            if (e.key === 'Enter') {
+                e.preventDefault();
+                this.addTag();
+            }
+        });
+    }
+
+    addTag() {
+        const value = this.input.value.trim();
+        if (value && !this.tags.has(value)) {
+            this.tags.add(value);
+            this.renderTags();
+        }
+        this.input.value = '';
+    }
+
+    removeTag(tag) {
+        this.tags.delete(tag);
+        this.renderTags();
+    }
+
+    renderTags() {
+        this.container.innerHTML = '';
+        this.tags.forEach(tag => {
+            const tagElement = document.createElement('div');
+            tagElement.className = 'tag';
+            tagElement.innerHTML = `
+                ${tag}
+                <button onclick="event.stopPropagation(); ${this.container.id}Manager.removeTag('${tag}')">
+                    <i class="fas fa-times"></i>
+                </button>
+            `;
+            this.container.appendChild(tagElement);
+        });
+    }
+
+    getTags() {
+        return Array.from(this.tags);
+    }
+}
+
+const allergyManager = new TagManager('allergyInput', 'allergyTags');
+const medicationManager = new TagManager('medicationInput', 'medicationTags');
+
+document.getElementById('submitBtn').addEventListener('click', async () => {
+    const condition = document.getElementById('condition').value.trim();
+    if (!condition) {
+        alert('Please describe your medical condition to receive personalized recommendations.');
+        return;
+    }
+
+    // Show loading spinner
+    document.getElementById('loadingSpinner').style.display = 'block';
+    document.getElementById('submitBtn').disabled = true;
+    document.getElementById('resultContainer').style.display = 'none';
+
+    try {
+        const response = await fetch('/jobs/personalized-medication', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                condition: condition,
+                allergies: allergyManager.getTags(),
+                current_medications: medicationManager.getTags()
+            })
+        });
+
+        let job = await response.json();
+        if (!response.ok) {
+            throw new Error(job.error);
+        }
+
+        // Poll until the job has finished; plain polls keep server workers free
+        while (job.status === 'queued' || job.status === 'running') {
+            await new Promise(resolve => setTimeout(resolve, 1000));
+            const pollResponse = await fetch(`/jobs/${job.job_id}`);
+            job = await pollResponse.json();
+            if (!pollResponse.ok) {
+                throw new Error(job.error);
+            }
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error);
+        }
+
+        const data = job.result;
+
+        // Display recommendations
+        document.getElementById('recommendationsContent').innerHTML = `
+            <div class="recommendations-content">
+                ${data.recommendations}
+            </div>
+        `;
+
+        // Display interactions if any
+        const interactionsDiv = document.getElementById('interactionsContent');
+        if (Object.keys(data.interactions).length > 0) {
+            let interactionsHtml = '<h3>Potential Drug Interactions</h3><ul>';
+            for (const [drug, interactions] of Object.entries(data.interactions)) {
+                interactionsHtml += `
+                    <li>
+                        <strong>${drug}:</strong>
+                        <ul>
+                            ${interactions.map(int => `<li>${int.description}</li>`).join('')}
+                        </ul>
+                    </li>
+                `;
+            }
+            interactionsHtml += '</ul>';
+            interactionsDiv.innerHTML = interactionsHtml;
+            interactionsDiv.style.display = 'block';
+        } else {
+            interactionsDiv.style.display = 'none';
+        }
+
+        // Show results
+        document.getElementById('resultContainer').style.display = 'block';
+        document.getElementById('resultContainer').classList.add('visible');
+    } catch (error) {
+        console.error('Error:', error);
+        alert('An error occurred while generating recommendations. Please try again.');
+    } finally {
+        // Hide loading spinner and enable submit button
+        document.getElementById('loadingSpinner').style.display = 'none';
+        document.getElementById('submitBtn').disabled = false;
+    }
+});
+
+// Make the tag managers globally accessible
+window.allergyTagsManager = allergyManager;
+window.medicationTagsManager = medicationManager;
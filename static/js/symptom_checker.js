@@ -0,0 +1,40 @@
+document.getElementById('submitBtn').addEventListener('click', async () => {
+    const symptoms = document.getElementById('symptomsInput').value.trim();
+    if (!symptoms) {
+        alert('Please describe your symptoms to receive an analysis.');
+        return;
+    }
+
+    // Show loading spinner
+    document.getElementById('loadingSpinner').style.display = 'block';
+    document.getElementById('submitBtn').disabled = true;
+    document.getElementById('resultContainer').style.display = 'none';
+
+    try {
+        const response = await fetch('/symptom-checker', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ symptoms })
+        });
+
+        const data = await response.json();
+
+        // Display results
+        document.getElementById('analysisResult').innerHTML = `
+            <div class="analysis-content">
+                ${data.result}
+            </div>
+        `;
+        document.getElementById('resultContainer').style.display = 'block';
+        document.getElementById('resultContainer').classList.add('visible');
+    } catch (error) {
+        console.error('Error:', error);
+        alert('An error occurred while analyzing your symptoms. Please try again.');
+    } finally {
+        // Hide loading spinner and enable submit button
+        document.getElementById('loadingSpinner').style.display = 'none';
+        document.getElementById('submitBtn').disabled = false;
+    }
+});
@@ -1,10 +1,16 @@
 import os
-import groq
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from dotenv import load_dotenv
+from cache import cached, LLM_CACHE_TTL
 
-def setup_groq_client() -> Optional[groq.Client]:
+if TYPE_CHECKING:
+    import groq
+
+def setup_groq_client() -> Optional['groq.Client']:
     """Set up and return Groq client with API key."""
+    # Imported here because groq is slow to import and only needed for API calls
+    import groq
+
     # Load environment variables from .env file
     load_dotenv()
     
@@ -14,11 +20,13 @@ def setup_groq_client() -> Optional[groq.Client]:
         return None
     return groq.Client(api_key=api_key)
 
-def get_disease_from_symptoms(symptoms: str) -> Optional[str]:
+@cached('llm:symptoms', LLM_CACHE_TTL)
+def get_disease_from_symptoms(symptoms: str, client: Optional['groq.Client'] = None) -> Optional[str]:
     """
     Queries Groq API to analyze symptoms and return the most likely disease with a description.
+    Pass an existing `client` to reuse it across many calls.
     """
-    client = setup_groq_client()
+    client = client or setup_groq_client()
     if not client:
         return None
 